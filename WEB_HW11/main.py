@@ -1,13 +1,15 @@
-import redis.asyncio as redis
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
-from src.config.config import settings
+from fastapi.middleware.gzip import GZipMiddleware
+from src.database.db import warm_up_pool
+from src.services.auth import auth_service
+from src.services.limiter import TokenBucket
 
 from src.routes import auth, contacts, users
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.include_router(auth.router, prefix='/api')
 app.include_router(contacts.router, prefix='/api')
@@ -16,9 +18,8 @@ app.include_router(users.router, prefix='/api')
 
 @app.on_event('startup')
 async def startup():
-    r = await redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0, encoding='utf-8',
-                          decode_responses=True)
-    await FastAPILimiter.init(r)
+    await TokenBucket.init(auth_service.r)
+    await warm_up_pool()
 
 
 origins = ['http://localhost:3000']
@@ -29,6 +30,7 @@ app.add_middleware(
     allow_methods=['*'],
     allow_headers=['*'],
 )
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
 
 
 @app.get("/")
@@ -36,5 +38,7 @@ def read_root():
     return {"message": "Hello world!"}
 
 
+# In production start the workers with PYTHONOPTIMIZE=2 (the same as python -OO) to drop docstrings from memory.
+# FastAPI builds the route descriptions from those docstrings, so /docs then shows no descriptions.
 if __name__ == '__main__':
     uvicorn.run(app, host='localhost', port=8000)
@@ -0,0 +1,31 @@
+"""add contacts search indexes
+
+Revision ID: 8b4e7a9c2d10
+Revises: 3f6c2b1d8e5a
+Create Date: 2026-10-14 11:03:27.904615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b4e7a9c2d10'
+down_revision = '3f6c2b1d8e5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_contacts_user_first_name', 'contacts',
+                    ['user_id', sa.text('lower(first_name) text_pattern_ops')], unique=False)
+    op.create_index('ix_contacts_user_last_name', 'contacts',
+                    ['user_id', sa.text('lower(last_name) text_pattern_ops')], unique=False)
+    op.create_index('ix_contacts_user_email', 'contacts',
+                    ['user_id', sa.text('lower(email) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_user_email', table_name='contacts')
+    op.drop_index('ix_contacts_user_last_name', table_name='contacts')
+    op.drop_index('ix_contacts_user_first_name', table_name='contacts')
@@ -0,0 +1,27 @@
+"""add contacts user_id id index
+
+Revision ID: c5a91e3f7b24
+Revises: 8b4e7a9c2d10
+Create Date: 2026-10-14 11:48:09.331742
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a91e3f7b24'
+down_revision = '8b4e7a9c2d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_contacts_user_id_id', 'contacts', ['user_id', 'id'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_contacts_user_id_id', table_name='contacts', postgresql_concurrently=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -21,6 +21,15 @@ class Contact(Base):
     user = relationship('User', backref='contacts')
 
 
+Index('ix_contacts_user_id_id', Contact.user_id, Contact.id)
+Index('ix_contacts_user_first_name', Contact.user_id, func.lower(Contact.first_name).label('first_name_lower'),
+      postgresql_ops={'first_name_lower': 'text_pattern_ops'})
+Index('ix_contacts_user_last_name', Contact.user_id, func.lower(Contact.last_name).label('last_name_lower'),
+      postgresql_ops={'last_name_lower': 'text_pattern_ops'})
+Index('ix_contacts_user_email', Contact.user_id, func.lower(Contact.email).label('email_lower'),
+      postgresql_ops={'email_lower': 'text_pattern_ops'})
+
+
 class User(Base):
     __tablename__ = 'users'
 
@@ -29,5 +38,6 @@ class User(Base):
     email = Column(String, nullable=False, unique=True)
     password = Column(String, nullable=False)
     created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     avatar = Column(String, nullable=True)
     refresh_token = Column(String, nullable=True)
@@ -1,38 +1,45 @@
 from datetime import date
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from src.database.models import Contact, User
 from src.schemas import ContactModel
 
 
-async def get_contacts(skip: int, limit: int, first_name: str, last_name: str, email: str, user: User, db: Session):
-    first_name_query = db.query(Contact).filter(and_(Contact.first_name == first_name, Contact.user_id == user.id))
-    last_name_query = db.query(Contact).filter(and_(Contact.last_name == last_name, Contact.user_id == user.id))
-    email_query = db.query(Contact).filter(and_(Contact.email == email, Contact.user_id == user.id))
-    if first_name and last_name and email:
-        return first_name_query.union(last_name_query).union(email_query).all()
-    if first_name and last_name:
-        return first_name_query.union(last_name_query).all()
-    if first_name and email:
-        return first_name_query.union(email_query).all()
-    if last_name and email:
-        return last_name_query.union(email_query).all()
+def _prefix_pattern(value: str):
+    escaped = value.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'{escaped}%'
+
+
+async def get_contacts(skip: int, limit: int, first_name: str, last_name: str, email: str, user: User,
+                       db: AsyncSession, last_id: int | None = None):
+    stmt = select(Contact).where(Contact.user_id == user.id).options(raiseload(Contact.user))
+    filters = []
     if first_name:
-        return first_name_query.all()
+        filters.append(func.lower(Contact.first_name).like(_prefix_pattern(first_name), escape='\\'))
     if last_name:
-        return last_name_query.all()
+        filters.append(func.lower(Contact.last_name).like(_prefix_pattern(last_name), escape='\\'))
     if email:
-        return email_query.all()
-    return db.query(Contact).filter(Contact.user_id == user.id).offset(skip).limit(limit).all()
+        filters.append(func.lower(Contact.email).like(_prefix_pattern(email), escape='\\'))
+    if filters:
+        stmt = stmt.where(or_(*filters))
+    if last_id is not None:
+        stmt = stmt.where(Contact.id > last_id)
+    else:
+        stmt = stmt.offset(skip)
+    contacts = await db.execute(stmt.order_by(Contact.id).limit(limit))
+    return contacts.scalars().all()
 
 
-async def get_contacts_birthdays(skip: int, limit: int, user: User, db: Session):
+async def get_contacts_birthdays(skip: int, limit: int, user: User, db: AsyncSession):
     contacts_with_birthdays = []
     today = date.today()
     current_year = today.year
-    contacts = db.query(Contact).filter(Contact.user_id == user.id).offset(skip).limit(limit).all()
+    stmt = (select(Contact).where(Contact.user_id == user.id).options(raiseload(Contact.user))
+            .offset(skip).limit(limit))
+    contacts = (await db.execute(stmt)).scalars().all()
     for contact in contacts:
         td = contact.date_of_birth.replace(year=current_year) - today
         if 0 <= td.days <= 7:
@@ -42,33 +49,42 @@ async def get_contacts_birthdays(skip: int, limit: int, user: User, db: Session)
     return contacts_with_birthdays
 
 
-async def get_contact_by_id(contact_id: int, user: User, db: Session):
-    return db.query(Contact).filter(and_(Contact.id == contact_id, Contact.user_id == user.id)).first()
+async def get_contact_by_id(contact_id: int, user: User, db: AsyncSession):
+    stmt = select(Contact).where(Contact.id == contact_id, Contact.user_id == user.id)
+    contact = await db.execute(stmt)
+    return contact.scalar_one_or_none()
+
+
+async def get_contacts_by_ids(contact_ids: list[int], user: User, db: AsyncSession):
+    stmt = select(Contact).where(Contact.id.in_(contact_ids), Contact.user_id == user.id)
+    contacts = await db.execute(stmt)
+    return contacts.scalars().all()
 
 
-async def create_contact(body: ContactModel, user: User, db: Session):
+async def create_contact(body: ContactModel, user: User, db: AsyncSession):
     contact = Contact(**body.dict(), user_id=user.id)
     db.add(contact)
-    db.commit()
-    db.refresh(contact)
+    await db.commit()
+    await db.refresh(contact)
     return contact
 
 
-async def update_contact(contact_id: int, body: ContactModel, user: User, db: Session):
-    contact = db.query(Contact).filter(and_(Contact.id == contact_id, Contact.user_id == user.id)).first()
+async def update_contact(contact_id: int, body: ContactModel, user: User, db: AsyncSession):
+    contact = await get_contact_by_id(contact_id, user, db)
     if contact:
         contact.first_name = body.first_name
         contact.last_name = body.last_name
         contact.email = body.email
         contact.phone = body.phone
         contact.date_of_birth = body.date_of_birth
-        db.commit()
+        await db.commit()
+        await db.refresh(contact)
     return contact
 
 
-async def remove_contact(contact_id: int, user: User, db: Session):
-    contact = db.query(Contact).filter(and_(Contact.id == contact_id, Contact.user_id == user.id)).first()
+async def remove_contact(contact_id: int, user: User, db: AsyncSession):
+    contact = await get_contact_by_id(contact_id, user, db)
     if contact:
-        db.delete(contact)
-        db.commit()
+        await db.delete(contact)
+        await db.commit()
     return contact
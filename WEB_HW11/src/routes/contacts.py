@@ -1,126 +1,213 @@
-from fastapi import APIRouter, HTTPException, Depends, status, Query
-from fastapi_limiter.depends import RateLimiter
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import json
+from email.message import Message
+from functools import lru_cache
+from hashlib import blake2b
+
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, Request, Response, status, Path, Query
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import DictError, MissingError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, List, Optional
 
 from src.database.db import get_db
 from src.database.models import User
 from src.repository import contacts as repository_contacts
 from src.schemas import ContactModel, ContactResponse
-from src.services.auth import auth_service
+from src.services.limiter import contact_limiter
+from src.services.loaders import ContactLoader, get_contact_loader
 
 router = APIRouter(prefix='/contacts', tags=['contacts'])
 
+ContactId = Annotated[int, Path(ge=1, le=2 ** 31 - 1)]
 
-@router.get('/', response_model=List[ContactResponse], name='Get a list of contacts',
-            description='Request limit exceeded', dependencies=[Depends(RateLimiter(times=20, seconds=60))])
-async def get_contact_by_params(skip: int = 0, limit: int = Query(default=10),
+_404_CONTACT = orjson.dumps({'detail': 'Contact not found'})
+_404_CONTACTS = orjson.dumps({'detail': 'Contacts not found'})
+
+
+def not_found(content: bytes) -> Response:
+    return Response(content=content, status_code=status.HTTP_404_NOT_FOUND, media_type='application/json')
+
+
+contact_bodies = TTLCache(maxsize=1024, ttl=0.1)
+contact_body_openapi = {'requestBody': {'content': {'application/json': {'schema': ContactModel.schema()}},
+                                        'required': True}}
+
+
+@lru_cache(maxsize=64)
+def is_json(content_type: Optional[str]) -> bool:
+    """
+    The is_json function checks the Content-Type header the same way FastAPI does for JSON bodies:
+    a missing header, application/json and application/*+json are all read as JSON.
+
+    :param content_type: Optional[str]: The Content-Type header of the request
+    :return: True if the body should be parsed as JSON
+    """
+    if not content_type:
+        return True
+    message = Message()
+    message['content-type'] = content_type
+    subtype = message.get_content_subtype()
+    return message.get_content_maintype() == 'application' and (subtype == 'json' or subtype.endswith('+json'))
+
+
+def parse_contact(raw: bytes) -> ContactModel:
+    """
+    The parse_contact function validates a raw JSON body as a ContactModel.
+    Errors are raised with the same locations FastAPI reports for a ContactModel body parameter.
+
+    :param raw: bytes: The raw request body
+    :return: A ContactModel object
+    """
+    try:
+        data = json.loads(raw) if raw else None
+    except json.JSONDecodeError as e:
+        raise RequestValidationError([ErrorWrapper(e, loc=('body', e.pos))], body=e.doc)
+    if data is None:
+        raise RequestValidationError([ErrorWrapper(MissingError(), loc=('body',))], body=data)
+    try:
+        return ContactModel.validate(data)
+    except (TypeError, ValueError) as e:
+        raise RequestValidationError([ErrorWrapper(e, loc=('body',))], body=data)
+
+
+async def contact_body(request: Request, current_user: User = Depends(contact_limiter)) -> ContactModel:
+    """
+    The contact_body function parses the request body into a ContactModel.
+    Validated models are cached for a short time by the current user and the blake2b hash of the raw body,
+    so repeated identical bodies (e.g. bulk imports) skip validation. Every call gets its own copy of the model.
+    Bodies that are not sent as JSON are rejected like FastAPI rejects them.
+
+    :param request: Request: Read the raw request body
+    :param current_user: User: Keep cached bodies separate per user
+    :return: A ContactModel object
+    """
+    raw = await request.body()
+    if raw and not is_json(request.headers.get('content-type')):
+        raise RequestValidationError([ErrorWrapper(DictError(), loc=('body',))], body=raw)
+    key = (current_user.id, blake2b(raw, digest_size=16).digest())
+    body = contact_bodies.get(key)
+    if body is None:
+        body = parse_contact(raw)
+        contact_bodies[key] = body
+    return body.copy()
+
+@router.get('/', response_model=None, responses={200: {'model': List[ContactResponse]}},
+            name='Get a list of contacts', description='Request limit exceeded')
+async def get_contact_by_params(skip: Annotated[int, Query(ge=0, le=1000)] = 0,
+                                limit: Annotated[int, Query(ge=1, le=1000)] = 10,
                                 first_name: Optional[str] = Query(default=None),
                                 last_name: Optional[str] = Query(default=None),
                                 email: Optional[str] = Query(default=None),
-                                db: Session = Depends(get_db),
-                                current_user: User = Depends(auth_service.get_current_user)):
+                                last_id: Annotated[Optional[int], Query(ge=0, le=2 ** 31 - 1)] = None,
+                                db: AsyncSession = Depends(get_db),
+                                current_user: User = Depends(contact_limiter)) -> ORJSONResponse:
     """
     The get_contact_by_params function is used to get a list of contacts based on the parameters passed in.
         The function will return a list of contacts that match the parameters passed in. If no contact matches, an empty
-        array will be returned.
+        array will be returned. Names and email are matched case-insensitively by prefix.
 
     :param skip: int: Skip the first n number of records
     :param limit: int: Limit the number of contacts returned
     :param first_name: Optional[str]: Filter the contacts by first name
     :param last_name: Optional[str]: Filter the contacts by last name
     :param email: Optional[str]: Filter contacts by email
-    :param db: Session: Pass the database session to the function
+    :param last_id: Optional[int]: Return contacts after this id instead of skipping records
+    :param db: AsyncSession: Pass the database session to the function
     :param current_user: User: Get the current user from the database
     :return: A list of contacts that match the parameters
     :doc-author: Trelent
     """
-    contact = await repository_contacts.get_contacts(skip, limit, first_name, last_name, email, current_user, db)
-    if not contact:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contacts not found")
-    return contact
+    contacts = await repository_contacts.get_contacts(skip, limit, first_name, last_name, email, current_user, db,
+                                                   last_id)
+    if not contacts:
+        return not_found(_404_CONTACTS)
+    return ORJSONResponse([ContactResponse.trusted_dict(contact) for contact in contacts])
 
 
-@router.get("/{contact_id}", response_model=ContactResponse, name='Get contact by id',
-            description='Request limit exceeded', dependencies=[Depends(RateLimiter(times=20, seconds=60))])
-async def get_contact(contact_id: int, db: Session = Depends(get_db),
-                      current_user: User = Depends(auth_service.get_current_user)):
+@router.get("/{contact_id}", response_model=None, responses={200: {'model': ContactResponse}}, name='Get contact by id',
+            description='Request limit exceeded', dependencies=[Depends(contact_limiter)])
+async def get_contact(contact_id: ContactId, loader: ContactLoader = Depends(get_contact_loader)) -> ContactResponse:
     """
     The get_contact function is a GET request that returns the contact with the given ID.
     It requires an authorization token in order to access it, and will return a 404 error if no contact exists with that ID.
 
     :param contact_id: int: Get the contact id from the url
-    :param db: Session: Get a database session
-    :param current_user: User: Get the user that is currently logged in
+    :param loader: ContactLoader: Batch contact lookups of the current user within the request
     :return: A contact object
     :doc-author: Trelent
     """
-    contact = await repository_contacts.get_contact_by_id(contact_id, current_user, db)
+    contact = await loader.load(contact_id)
     if contact is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
-    return contact
+        return not_found(_404_CONTACT)
+    return ContactResponse.from_trusted(contact)
 
 
-@router.post("/", response_model=ContactResponse, description='Request limit exceeded ',
-             dependencies=[Depends(RateLimiter(times=20, seconds=60))], status_code=status.HTTP_201_CREATED)
-async def create_contact(body: ContactModel, db: Session = Depends(get_db),
-                         current_user: User = Depends(auth_service.get_current_user)):
+@router.post("/", response_model=None, responses={201: {'model': ContactResponse}},
+             description='Request limit exceeded ', status_code=status.HTTP_201_CREATED,
+             openapi_extra=contact_body_openapi)
+async def create_contact(current_user: User = Depends(contact_limiter),
+                         body: ContactModel = Depends(contact_body),
+                         db: AsyncSession = Depends(get_db)) -> ContactResponse:
     """
     The create_contact function creates a new contact in the database.
         The function takes a ContactModel object as input, which is validated by pydantic.
-        The function also takes an optional db Session object and current_user User object as inputs,
+        The function also takes an optional db AsyncSession object and current_user User object as inputs,
             both of which are provided by dependency injection via FastAPI's Depends decorator.
 
     :param body: ContactModel: Get the data from the request body
-    :param db: Session: Pass the database connection to the function
+    :param db: AsyncSession: Pass the database connection to the function
     :param current_user: User: Get the user id of the logged in user
     :return: A contactmodel object
     :doc-author: Trelent
     """
     new_contact = await repository_contacts.create_contact(body, current_user, db)
-    return new_contact
+    return ContactResponse.from_trusted(new_contact)
 
 
-@router.put("/{contact_id}", response_model=ContactResponse)
-async def update_contact(body: ContactModel, contact_id: int, db: Session = Depends(get_db),
-                         current_user: User = Depends(auth_service.get_current_user)):
+@router.put("/{contact_id}", response_model=None, responses={200: {'model': ContactResponse}},
+            openapi_extra=contact_body_openapi)
+async def update_contact(contact_id: ContactId, current_user: User = Depends(contact_limiter),
+                         body: ContactModel = Depends(contact_body),
+                         db: AsyncSession = Depends(get_db)) -> ContactResponse:
     """
     The update_contact function updates a contact in the database.
         The function takes three arguments:
             - body: A ContactModel object containing the new values for the contact.
             - contact_id: An integer representing the ID of an existing contact to be updated.
-            - db (optional): A Session object that can be used to access and modify data in a database, if needed.  This is provided by FastAPI's dependency injection system, which we'll learn more about later on in this tutorial series.
+            - db (optional): An AsyncSession object that can be used to access and modify data in a database, if needed.  This is provided by FastAPI's dependency injection system, which we'll learn more about later on in this tutorial series.
 
     :param body: ContactModel: Get the data from the request body
     :param contact_id: int: Specify the contact that is being updated
-    :param db: Session: Get the database session
+    :param db: AsyncSession: Get the database session
     :param current_user: User: Get the current user from the database
     :return: A contactmodel object
     :doc-author: Trelent
     """
     contact = await repository_contacts.update_contact(contact_id, body, current_user, db)
     if contact is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                            detail="Contact not found")
-    return contact
+        return not_found(_404_CONTACT)
+    return ContactResponse.from_trusted(contact)
 
 
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_tag(contact_id: int, db: Session = Depends(get_db),
-                     current_user: User = Depends(auth_service.get_current_user)):
+async def remove_tag(contact_id: ContactId, db: AsyncSession = Depends(get_db),
+                     current_user: User = Depends(contact_limiter)):
     """
     The remove_tag function removes a tag from the database.
         The function takes in an integer contact_id and returns the removed contact.
-        If no such contact exists, it raises a 404 error.
+        If no such contact exists, it returns a 404 error.
 
     :param contact_id: int: Specify the id of the contact to be removed
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :param current_user: User: Get the current user
     :return: A contact object
     :doc-author: Trelent
     """
     contact = await repository_contacts.remove_contact(contact_id, current_user, db)
     if contact is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                            detail="Contact not found")
+        return not_found(_404_CONTACT)
     return contact
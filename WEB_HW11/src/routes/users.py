@@ -1,7 +1,12 @@
+import asyncio
+from urllib.parse import quote
+
 import cloudinary
 import cloudinary.uploader
-from fastapi import APIRouter, Depends, UploadFile, File
-from sqlalchemy.orm import Session
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, UploadFile, File, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config.config import settings
 from src.database.db import get_db
@@ -9,26 +14,42 @@ from src.database.models import User
 from src.repository import users as repository_users
 from src.schemas import UserDb
 from src.services.auth import auth_service
+from src.services.limiter import TokenBucket
 
 router = APIRouter(prefix='/users', tags=['users'])
 
+cloudinary.config(
+    cloud_name=settings.cloudinary_name,
+    api_key=settings.cloudinary_api_key,
+    api_secret=settings.cloudinary_api_secret,
+    secure=True
+)
+CLOUDINARY_BASE = f'https://res.cloudinary.com/{settings.cloudinary_name}/image/upload'
+
+me_cache = TTLCache(maxsize=1024, ttl=300)
+
 
 @router.get('/me/', response_model=UserDb)
-async def read_users_me(current_user: User = Depends(auth_service.get_current_user)):
+async def read_users_me(current_user: User = Depends(TokenBucket(cap=20, rate=20 / 60))):
     """
     The read_users_me function is a GET endpoint that returns the current user's information.
     It uses the auth_service to get the current user, and then returns it.
+    The serialized body is cached by user id and updated_at, so it is only rebuilt after the user changes.
 
     :param current_user: User: Get the current user
-    :return: The current user object
+    :return: The current user serialized as JSON
     :doc-author: Trelent
     """
-    return current_user
+    key = (current_user.id, current_user.updated_at)
+    content = me_cache.get(key)
+    if content is None:
+        content = me_cache[key] = orjson.dumps(UserDb.from_orm(current_user).dict())
+    return Response(content=content, media_type='application/json')
 
 
 @router.patch('/avatar', response_model=UserDb)
 async def update_avatar_user(file: UploadFile = File(), current_user: User = Depends(auth_service.get_current_user),
-                             db: Session = Depends(get_db)):
+                             db: AsyncSession = Depends(get_db)):
     """
     The update_avatar_user function takes in a file, current_user and db as parameters.
     The function then uploads the file to cloudinary using the username of the current user as its public id.
@@ -37,20 +58,13 @@ async def update_avatar_user(file: UploadFile = File(), current_user: User = Dep
 
     :param file: UploadFile: Upload the file to cloudinary
     :param current_user: User: Get the current user's email
-    :param db: Session: Pass the database session to the repository layer
+    :param db: AsyncSession: Pass the database session to the repository layer
     :return: A user
     :doc-author: Trelent
     """
-    cloudinary.config(
-        cloud_name=settings.cloudinary_name,
-        api_key=settings.cloudinary_api_key,
-        api_secret=settings.cloudinary_api_secret,
-        secure=True
-    )
-
-    r = cloudinary.uploader.upload(
-        file.file, public_id=f'ContactsApp/{current_user.username}', overwrite=True)
-    src_url = cloudinary.CloudinaryImage(f'ContactsApp/{current_user.username}').build_url(
-        width=250, height=250, crop='fill', version=r.get('version'))
+    public_id = f'ContactsApp/{current_user.username}'
+    r = await asyncio.to_thread(cloudinary.uploader.upload, file.file, public_id=public_id, overwrite=True)
+    src_url = f"{CLOUDINARY_BASE}/c_fill,h_250,w_250/v{r['version']}/{quote(public_id, safe='/:')}"
     user = await repository_users.update_avatar(current_user.email, src_url, db)
+    await auth_service.invalidate_user(current_user.email)
     return user
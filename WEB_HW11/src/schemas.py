@@ -18,6 +18,14 @@ class ContactResponse(ContactModel):
     class Config:
         orm_mode = True
 
+    @classmethod
+    def trusted_dict(cls, obj):
+        return {name: getattr(obj, name) for name in cls.__fields__}
+
+    @classmethod
+    def from_trusted(cls, obj):
+        return cls.construct(**cls.trusted_dict(obj))
+
 
 class UserModel(BaseModel):
     username: str
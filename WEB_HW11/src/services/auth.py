@@ -1,13 +1,16 @@
 import pickle
-import redis
+import time
+import redis.asyncio as redis
 from typing import Optional
 
+from cachetools import TTLCache
+
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.repository import users as repository_users
@@ -20,6 +23,7 @@ class Auth:
     ALGORITHM = settings.algorithm
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/auth/login')
     r = redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0)
+    user_cache = TTLCache(maxsize=1024, ttl=30)
 
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
@@ -57,35 +61,53 @@ class Auth:
         except JWTError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate credentials')
 
-    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-        credentials_exception = HTTPException(
+    def credentials_exception(self):
+        return HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Could not validate credentials',
             headers={'WWW-Authenticate': 'Bearer'},
         )
 
+    def decode_access_token(self, token: str):
         try:
             payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
             if payload['scope'] == 'access_token':
-                email = payload['sub']
-                if email is None:
-                    raise credentials_exception
+                if payload['sub'] is None:
+                    raise self.credentials_exception()
             else:
-                raise credentials_exception
+                raise self.credentials_exception()
         except JWTError as e:
-            raise credentials_exception
+            raise self.credentials_exception()
+        return payload
 
-        user = self.r.get(f'user:{email}')
-        if user is None:
+    async def load_user(self, token: str, payload: dict, cached_user: bytes | None, db: AsyncSession):
+        email = payload['sub']
+        if cached_user is None:
             user = await repository_users.get_user_by_email(email, db)
             if user is None:
-                raise credentials_exception
-            self.r.set(f'user:{email}', pickle.dumps(user))
-            self.r.expire(f'user:{email}', 900)
+                raise self.credentials_exception()
+            await self.r.setex(f'user:{email}', 900, pickle.dumps(user))
         else:
-            user = pickle.loads(user)
+            user = pickle.loads(cached_user)
+        if payload['exp'] - time.time() > self.user_cache.ttl:
+            self.user_cache[token] = user
         return user
 
+    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+        user = self.user_cache.get(token)
+        if user is not None:
+            return user
+
+        payload = self.decode_access_token(token)
+        cached_user = await self.r.get(f'user:{payload["sub"]}')
+        return await self.load_user(token, payload, cached_user, db)
+
+    async def invalidate_user(self, email: str):
+        await self.r.delete(f'user:{email}')
+        for token, user in list(self.user_cache.items()):
+            if user.email == email:
+                self.user_cache.pop(token, None)
+
     def create_email_token(self, data: dict):
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=7)
@@ -0,0 +1,103 @@
+import math
+import time
+
+from redis.asyncio import Redis
+from fastapi import Depends, HTTPException, Request, status
+from redis.exceptions import NoScriptError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import get_db
+from src.services.auth import auth_service
+
+# KEYS[1] - bucket key, ARGV[1] - now (ms), ARGV[2] - capacity, ARGV[3] - refill rate (tokens per ms).
+# Returns {allowed, ms until the next token}.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+
+local bucket = redis.call('HMGET', key, 'tokens', 'last_refill')
+local tokens = tonumber(bucket[1])
+local last_refill = tonumber(bucket[2])
+if tokens == nil or last_refill == nil then
+    tokens = capacity
+    last_refill = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - last_refill) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'last_refill', now)
+redis.call('PEXPIRE', key, math.ceil(capacity / rate))
+return {allowed, retry_after}
+"""
+
+
+class TokenBucket:
+    redis: Redis | None = None
+    sha: str | None = None
+
+    def __init__(self, cap: int, rate: float):
+        """
+        :param cap: int: Maximum number of requests allowed in a burst
+        :param rate: float: Number of tokens added to the bucket per second
+        """
+        self.cap = cap
+        self.rate = rate / 1000
+
+    @classmethod
+    async def init(cls, r: Redis):
+        cls.redis = r
+        cls.sha = await r.script_load(TOKEN_BUCKET_SCRIPT)
+
+    async def execute(self, key: str, *names: str):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.evalsha(self.sha, 1, key, int(time.time() * 1000), self.cap, self.rate)
+            for name in names:
+                pipe.get(name)
+            return await pipe.execute()
+
+    async def consume(self, key: str, *names: str):
+        try:
+            return await self.execute(key, *names)
+        except NoScriptError:
+            TokenBucket.sha = await self.redis.script_load(TOKEN_BUCKET_SCRIPT)
+            return await self.execute(key, *names)
+
+    async def __call__(self, request: Request, token: str = Depends(auth_service.oauth2_scheme),
+                       db: AsyncSession = Depends(get_db)):
+        """
+        The __call__ function authenticates the request and takes a token from the bucket of the current user.
+        When the user is not cached in process, the bucket check and the Redis user lookup
+        are sent in a single pipeline, so both cost one round-trip.
+
+        :param request: Request: Get the endpoint the bucket belongs to
+        :param token: str: Get the access token of the request
+        :param db: AsyncSession: Load the user from the database on a cache miss
+        :return: The current user
+        """
+        endpoint = request.scope['endpoint'].__name__
+        user = auth_service.user_cache.get(token)
+        if user is not None:
+            (allowed, retry_after), = await self.consume(f'rl:{user.email}:{endpoint}')
+        else:
+            payload = auth_service.decode_access_token(token)
+            email = payload['sub']
+            (allowed, retry_after), cached_user = await self.consume(f'rl:{email}:{endpoint}', f'user:{email}')
+        if not allowed:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail='Too Many Requests',
+                                headers={'Retry-After': str(math.ceil(retry_after / 1000))})
+        if user is None:
+            user = await auth_service.load_user(token, payload, cached_user, db)
+        return user
+
+
+contact_limiter = TokenBucket(cap=20, rate=20 / 60)
@@ -0,0 +1,38 @@
+from aiodataloader import DataLoader
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import get_db
+from src.database.models import User
+from src.repository import contacts as repository_contacts
+from src.services.limiter import contact_limiter
+
+
+class ContactLoader(DataLoader):
+    def __init__(self, user: User, db: AsyncSession):
+        super().__init__()
+        self.user = user
+        self.db = db
+
+    async def batch_load_fn(self, contact_ids):
+        contacts = await repository_contacts.get_contacts_by_ids(contact_ids, self.user, self.db)
+        contacts_by_id = {contact.id: contact for contact in contacts}
+        return [contacts_by_id.get(contact_id) for contact_id in contact_ids]
+
+
+async def get_contact_loader(request: Request, db: AsyncSession = Depends(get_db),
+                             current_user: User = Depends(contact_limiter)):
+    """
+    The get_contact_loader function returns the ContactLoader of the current request.
+    The loader is stored on request.state, so every lookup made while handling the request
+    is batched into a single query and cached by contact id.
+
+    :param request: Request: Keep the loader for the lifetime of the request
+    :param db: AsyncSession: Get the database session
+    :param current_user: User: Restrict lookups to the contacts of the current user, resolved by contact_limiter
+    :return: A ContactLoader object
+    """
+    loader = getattr(request.state, 'contact_loader', None)
+    if loader is None:
+        loader = request.state.contact_loader = ContactLoader(current_user, db)
+    return loader
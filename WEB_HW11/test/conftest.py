@@ -0,0 +1,125 @@
+import asyncio
+import os
+import tempfile
+from datetime import date
+
+import pytest
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'test.db')
+
+os.environ.update({
+    'SQLALCHEMY_DATABASE_URL': f'sqlite+aiosqlite:///{DB_PATH}',
+    'SECRET_KEY': 'secret_key',
+    'ALGORITHM': 'HS256',
+    'MAIL_USERNAME': 'contacts@example.com',
+    'MAIL_PASSWORD': 'password',
+    'MAIL_FROM': 'contacts@example.com',
+    'MAIL_PORT': '465',
+    'MAIL_SERVER': 'smtp.example.com',
+    'CLOUDINARY_NAME': 'cloud',
+    'CLOUDINARY_API_KEY': 'api_key',
+    'CLOUDINARY_API_SECRET': 'api_secret',
+})
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from main import app
+from src.database.db import get_db
+from src.database.models import Base, Contact, User
+from src.services.auth import auth_service
+from src.services.limiter import TokenBucket
+
+engine = create_engine(f'sqlite:///{DB_PATH}', connect_args={'check_same_thread': False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(f'sqlite+aiosqlite:///{DB_PATH}', poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False,
+                                              expire_on_commit=False)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, name):
+        return self.data.get(name)
+
+    async def setex(self, name, time, value):
+        self.data[name] = value
+
+    async def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+
+@pytest.fixture(scope='module')
+def session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope='module')
+def client(session):
+    async def override_get_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    yield TestClient(app)
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope='module')
+def user():
+    return {'username': 'deadpool', 'email': 'deadpool@example.com', 'password': '123456789'}
+
+
+@pytest.fixture()
+def bucket(monkeypatch):
+    """Replace Redis with an in-memory store; bucket.result is what the token bucket script returns."""
+    redis = FakeRedis()
+    monkeypatch.setattr(auth_service, 'r', redis)
+
+    class Bucket:
+        result = [1, 0]
+
+    async def consume(self, key, *names):
+        return [Bucket.result, *[await redis.get(name) for name in names]]
+
+    monkeypatch.setattr(TokenBucket, 'consume', consume)
+    return Bucket
+
+
+@pytest.fixture()
+def auth_headers(session, bucket):
+    owner = session.query(User).filter(User.email == 'owner@example.com').first()
+    if owner is None:
+        owner = User(username='owner', email='owner@example.com', password='password')
+        session.add(owner)
+        session.commit()
+    token = asyncio.run(auth_service.create_access_token(data={'sub': owner.email}))
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture()
+def contacts(session, auth_headers):
+    owner = session.query(User).filter(User.email == 'owner@example.com').first()
+    session.query(Contact).delete()
+    rows = [Contact(first_name=first_name, last_name='Smith', email=f'{first_name.lower()}@example.com',
+                    phone=f'+38050000000{i}', date_of_birth=date(1990, 1, 1), user_id=owner.id)
+            for i, first_name in enumerate(['Alice', 'Bob', 'Alina'])]
+    session.add_all(rows)
+    session.commit()
+    return rows
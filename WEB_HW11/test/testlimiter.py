@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.services.limiter import TokenBucket
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """Freeze time.time(); clock.now is the current time in seconds."""
+    class Clock:
+        now = 1_700_000_000.0
+
+    monkeypatch.setattr(time, 'time', lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture()
+def limiter(monkeypatch, clock):
+    monkeypatch.setattr(TokenBucket, 'redis', None)
+    monkeypatch.setattr(TokenBucket, 'sha', None)
+    return TokenBucket(cap=20, rate=20 / 60)
+
+
+def run(limiter, test):
+    async def main():
+        r = FakeRedis()
+        await TokenBucket.init(r)
+        await test(r)
+
+    asyncio.run(main())
+
+
+def test_bucket_denies_when_empty(limiter):
+    async def test(r):
+        for _ in range(20):
+            (allowed, retry_after), = await limiter.consume('rl:owner@example.com:get_contact')
+            assert (allowed, retry_after) == (1, 0)
+
+        (allowed, retry_after), = await limiter.consume('rl:owner@example.com:get_contact')
+        assert allowed == 0
+        assert 2999 <= retry_after <= 3001
+
+        assert 59_000 <= await r.pttl('rl:owner@example.com:get_contact') <= 60_000
+
+    run(limiter, test)
+
+
+def test_bucket_refills(limiter, clock):
+    async def test(r):
+        for _ in range(20):
+            await limiter.consume('rl:owner@example.com:get_contact')
+
+        clock.now += 3
+        (allowed, _), = await limiter.consume('rl:owner@example.com:get_contact')
+        assert allowed == 1
+        (allowed, _), = await limiter.consume('rl:owner@example.com:get_contact')
+        assert allowed == 0
+
+        clock.now += 3600
+        results = [(await limiter.consume('rl:owner@example.com:get_contact'))[0][0] for _ in range(21)]
+        assert results == [1] * 20 + [0]
+
+    run(limiter, test)
+
+
+def test_bucket_returns_pipelined_gets(limiter):
+    async def test(r):
+        await r.set('user:owner@example.com', b'cached user')
+        (allowed, _), cached_user = await limiter.consume('rl:owner@example.com:get_contact',
+                                                          'user:owner@example.com')
+        assert allowed == 1
+        assert cached_user == b'cached user'
+
+    run(limiter, test)
+
+
+def test_bucket_reloads_flushed_script(limiter):
+    async def test(r):
+        await limiter.consume('rl:owner@example.com:get_contact')
+        await r.script_flush()
+
+        (allowed, _), = await limiter.consume('rl:owner@example.com:get_contact')
+        assert allowed == 1
+        assert (await r.script_exists(TokenBucket.sha)) == [True]
+
+    run(limiter, test)
@@ -67,3 +67,61 @@ def test_login_wrong_email(client, user):
     assert response.status_code == 401, response.text
     data = response.json()
     assert data['detail'] == 'Invalid email'
+
+
+def test_rate_limit_exceeded(client, auth_headers, bucket):
+    bucket.result = [0, 1500]
+    response = client.get('/api/contacts/', headers=auth_headers)
+    assert response.status_code == 429, response.text
+    assert response.headers['Retry-After'] == '2'
+    assert response.json()['detail'] == 'Too Many Requests'
+
+
+def test_get_contacts_by_prefix(client, auth_headers, contacts):
+    response = client.get('/api/contacts/', params={'first_name': 'al'}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [contact['first_name'] for contact in data] == ['Alice', 'Alina']
+
+    response = client.get('/api/contacts/', params={'first_name': 'al', 'last_id': data[0]['id']},
+                          headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert [contact['first_name'] for contact in response.json()] == ['Alina']
+
+
+def test_get_contacts_last_id_out_of_range(client, auth_headers):
+    response = client.get('/api/contacts/', params={'last_id': 2 ** 31}, headers=auth_headers)
+    assert response.status_code == 422, response.text
+
+
+def test_create_contact_invalid_body(client, auth_headers):
+    response = client.post(
+        '/api/contacts/',
+        json={'first_name': 'Alice', 'last_name': 'Smith', 'email': 'not an email', 'phone': '+380500000000',
+              'date_of_birth': '1990-01-01'},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422, response.text
+    data = response.json()
+    assert data['detail'][0]['loc'] == ['body', 'email']
+
+
+def test_create_contact_not_json(client, auth_headers):
+    body = '{"first_name": "Alice", "last_name": "Smith", "email": "alice.new@example.com", ' \
+           '"phone": "+380501111111", "date_of_birth": "1990-01-01"}'
+    response = client.post('/api/contacts/', content=body, headers={**auth_headers, 'Content-Type': 'text/plain'})
+    assert response.status_code == 422, response.text
+    assert response.json()['detail'][0]['loc'] == ['body']
+
+    response = client.post('/api/contacts/', content='{"first_name":', headers={**auth_headers,
+                                                                               'Content-Type': 'application/json'})
+    assert response.status_code == 422, response.text
+    assert response.json()['detail'][0]['loc'] == ['body', 14]
+
+
+def test_get_contacts_skip_out_of_range(client, auth_headers):
+    response = client.get('/api/contacts/', params={'skip': 1001}, headers=auth_headers)
+    assert response.status_code == 422, response.text
+
+    response = client.get('/api/contacts/', params={'skip': 2 ** 63}, headers=auth_headers)
+    assert response.status_code == 422, response.text